@@ -35,180 +35,154 @@ bl_info = {
 }
 
 import bpy
-from mathutils import Vector, Euler
-from math import degrees, radians
-
-class ANIMOFFSET_OT_grab(bpy.types.Operator):
-    """Grab objects and offset their entire animation by the same amount"""
-    bl_idname = "anim_offset.grab"
-    bl_label = "Grab and Offset Animation"
-    bl_options = {'REGISTER', 'UNDO'}
-
-    start_locs = {}  # Stores initial locations of selected objects
+import numpy as np
+from mathutils import Vector
+
+def _kp_buffer(op, name, n):
+    """Return a reusable float32 buffer holding n keyframe value pairs"""
+    buffers = getattr(op, "_buffers", None)
+    if buffers is None:
+        buffers = op._buffers = {}
+    buf = buffers.get(name)
+    if buf is None or buf.size < n * 2:
+        buf = buffers[name] = np.empty(n * 2, dtype=np.float32)
+    return buf[:n * 2]
+
+# Per-operator delta construction and keyframe arithmetic; deltas are
+# plain 3-tuples, only indexed per fcurve, so a Vector isn't needed
+
+def _loc_delta(current, start):
+    return tuple(current - start)
+
+def _rot_delta(current, start):
+    # Euler angles are already radians, the same unit as the fcurve keys
+    return tuple(Vector(current) - Vector(start))
+
+def _scale_delta(current, start):
+    # Calculate scale factors
+    return (
+        current[0] / start[0] - 1,
+        current[1] / start[1] - 1,
+        current[2] / start[2] - 1
+    )
+
+def _apply_shift(values, d):
+    values += d
+
+def _apply_scale(values, d):
+    values *= (1 + d)
+
+def _make_offset_op(name, idname, label, description, attr, transform,
+                    make_delta, apply_delta):
+    """Build a modal operator that transforms objects with the given
+    bpy.ops.transform operator and offsets their `attr` fcurves by the
+    resulting delta. The three operators only differ in the attribute,
+    the transform call, and the per-keyframe arithmetic."""
 
     def modal(self, context, event):
         if event.type == 'MOUSEMOVE':
             return {'PASS_THROUGH'}
             
         elif event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-            # Apply the translation delta to all keyframes of selected objects
-            for obj in context.selected_objects:
-                if (obj.animation_data and obj.animation_data.action and 
-                    obj in self.start_locs):
-                    delta = obj.location - self.start_locs[obj]
-                    
-                    for fc in obj.animation_data.action.fcurves:
-                        if fc.data_path == "location":
-                            for kp in fc.keyframe_points:
-                                kp.co.y += delta[fc.array_index]
-                            fc.update()
+            # Apply the transform delta to all keyframes of selected
+            # objects; objects sharing one Action (linked duplicates)
+            # get their keyframes offset only once per distinct delta
+            seen_actions = set()
+            for obj, start, action, fcurves in self.targets:
+                current = getattr(obj, attr)
+                # Released without moving: nothing to rewrite
+                if current == start:
+                    continue
+                delta = make_delta(current, start)
+                key = (action.as_pointer(),
+                       tuple(round(c, 6) for c in delta))
+                if key in seen_actions:
+                    continue
+                seen_actions.add(key)
+
+                # Group fcurves that share a keyframe count so one broadcast
+                # covers the whole group; untouched axes need no rewrite
+                groups = {}
+                for fc in fcurves:
+                    d = delta[fc.array_index]
+                    if d == 0.0:
+                        continue
+                    groups.setdefault(len(fc.keyframe_points), []).append((fc, d))
+
+                for n, group in groups.items():
+                    d = np.array([gd for fc, gd in group],
+                                 dtype=np.float32)[:, None]
+                    # Bulk-offset keys and bezier handles, one row per fcurve
+                    for prop in ("co", "handle_left", "handle_right"):
+                        buf = _kp_buffer(self, prop, len(group) * n)
+                        buf = buf.reshape(len(group), n * 2)
+                        for row, (fc, gd) in zip(buf, group):
+                            fc.keyframe_points.foreach_get(prop, row)
+                        apply_delta(buf[:, 1::2], d)
+                        for row, (fc, gd) in zip(buf, group):
+                            fc.keyframe_points.foreach_set(prop, row)
+                    for fc, gd in group:
+                        fc.update()
             return {'FINISHED'}
             
         elif event.type in {'RIGHTMOUSE', 'ESC'}:
-            # Restore original positions on cancel
-            for obj in context.selected_objects:
-                if obj in self.start_locs:
-                    obj.location = self.start_locs[obj]
+            # Restore original values on cancel
+            for obj, start, action, fcurves in self.targets:
+                setattr(obj, attr, start)
             return {'CANCELLED'}
             
         return {'RUNNING_MODAL'}
 
     def invoke(self, context, event):
-        animated_objects = False
-        self.start_locs.clear()
+        # Instance state, so concurrent invocations can't share or leak it
+        self.targets = []
         
-        # Store initial positions of animated objects
+        # Snapshot the animated selection with its start values and
+        # matching fcurves; modal never re-reads context.selected_objects,
+        # so changing the selection mid-modal cannot corrupt the delta
         for obj in context.selected_objects:
             if obj.animation_data and obj.animation_data.action:
-                animated_objects = True
-                self.start_locs[obj] = obj.location.copy()
+                action = obj.animation_data.action
+                fcurves = [fc for fc in action.fcurves
+                           if fc.data_path == attr]
+                self.targets.append(
+                    (obj, getattr(obj, attr).copy(), action, fcurves))
         
-        if not animated_objects:
+        if not self.targets:
             self.report({'WARNING'}, "Select at least one animated object")
             return {'CANCELLED'}
             
         context.window_manager.modal_handler_add(self)
-        bpy.ops.transform.translate('INVOKE_DEFAULT')
+        getattr(bpy.ops.transform, transform)('INVOKE_DEFAULT')
         
         return {'RUNNING_MODAL'}
 
-class ANIMOFFSET_OT_rotate(bpy.types.Operator):
-    """Rotate objects and offset their entire animation by the same amount"""
-    bl_idname = "anim_offset.rotate"
-    bl_label = "Rotate and Offset Animation"
-    bl_options = {'REGISTER', 'UNDO'}
-
-    start_rots = {}  # Stores initial rotations of selected objects
-
-    def modal(self, context, event):
-        if event.type == 'MOUSEMOVE':
-            return {'PASS_THROUGH'}
-            
-        elif event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-            # Apply the rotation delta to all keyframes of selected objects
-            for obj in context.selected_objects:
-                if (obj.animation_data and obj.animation_data.action and 
-                    obj in self.start_rots):
-                    # Convert rotation difference to degrees for easier handling
-                    delta = Vector((
-                        degrees(obj.rotation_euler.x - self.start_rots[obj].x),
-                        degrees(obj.rotation_euler.y - self.start_rots[obj].y),
-                        degrees(obj.rotation_euler.z - self.start_rots[obj].z)
-                    ))
-                    
-                    for fc in obj.animation_data.action.fcurves:
-                        if fc.data_path == "rotation_euler":
-                            for kp in fc.keyframe_points:
-                                kp.co.y += radians(delta[fc.array_index])
-                            fc.update()
-            return {'FINISHED'}
-            
-        elif event.type in {'RIGHTMOUSE', 'ESC'}:
-            # Restore original rotations on cancel
-            for obj in context.selected_objects:
-                if obj in self.start_rots:
-                    obj.rotation_euler = self.start_rots[obj].copy()
-            return {'CANCELLED'}
-            
-        return {'RUNNING_MODAL'}
-
-    def invoke(self, context, event):
-        animated_objects = False
-        self.start_rots.clear()
-        
-        # Store initial rotations of animated objects
-        for obj in context.selected_objects:
-            if obj.animation_data and obj.animation_data.action:
-                animated_objects = True
-                self.start_rots[obj] = obj.rotation_euler.copy()
-        
-        if not animated_objects:
-            self.report({'WARNING'}, "Select at least one animated object")
-            return {'CANCELLED'}
-            
-        context.window_manager.modal_handler_add(self)
-        bpy.ops.transform.rotate('INVOKE_DEFAULT')
-        
-        return {'RUNNING_MODAL'}
-
-class ANIMOFFSET_OT_scale(bpy.types.Operator):
-    """Scale objects and offset their entire animation by the same factor"""
-    bl_idname = "anim_offset.scale"
-    bl_label = "Scale and Offset Animation"
-    bl_options = {'REGISTER', 'UNDO'}
-
-    start_scales = {}  # Stores initial scales of selected objects
-
-    def modal(self, context, event):
-        if event.type == 'MOUSEMOVE':
-            return {'PASS_THROUGH'}
-            
-        elif event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-            # Apply the scale factor to all keyframes of selected objects
-            for obj in context.selected_objects:
-                if (obj.animation_data and obj.animation_data.action and 
-                    obj in self.start_scales):
-                    # Calculate scale factors
-                    delta = Vector((
-                        obj.scale[0] / self.start_scales[obj][0] - 1,
-                        obj.scale[1] / self.start_scales[obj][1] - 1,
-                        obj.scale[2] / self.start_scales[obj][2] - 1
-                    ))
-                    
-                    for fc in obj.animation_data.action.fcurves:
-                        if fc.data_path == "scale":
-                            for kp in fc.keyframe_points:
-                                kp.co.y *= (1 + delta[fc.array_index])
-                            fc.update()
-            return {'FINISHED'}
-            
-        elif event.type in {'RIGHTMOUSE', 'ESC'}:
-            # Restore original scales on cancel
-            for obj in context.selected_objects:
-                if obj in self.start_scales:
-                    obj.scale = self.start_scales[obj].copy()
-            return {'CANCELLED'}
-            
-        return {'RUNNING_MODAL'}
-
-    def invoke(self, context, event):
-        animated_objects = False
-        self.start_scales.clear()
-        
-        # Store initial scales of animated objects
-        for obj in context.selected_objects:
-            if obj.animation_data and obj.animation_data.action:
-                animated_objects = True
-                self.start_scales[obj] = obj.scale.copy()
-        
-        if not animated_objects:
-            self.report({'WARNING'}, "Select at least one animated object")
-            return {'CANCELLED'}
-            
-        context.window_manager.modal_handler_add(self)
-        bpy.ops.transform.resize('INVOKE_DEFAULT')
-        
-        return {'RUNNING_MODAL'}
+    return type(name, (bpy.types.Operator,), {
+        "__doc__": description,
+        "bl_idname": idname,
+        "bl_label": label,
+        "bl_options": {'REGISTER', 'UNDO'},
+        "modal": modal,
+        "invoke": invoke,
+    })
+
+ANIMOFFSET_OT_grab = _make_offset_op(
+    "ANIMOFFSET_OT_grab", "anim_offset.grab",
+    "Grab and Offset Animation",
+    "Grab objects and offset their entire animation by the same amount",
+    "location", "translate", _loc_delta, _apply_shift)
+
+ANIMOFFSET_OT_rotate = _make_offset_op(
+    "ANIMOFFSET_OT_rotate", "anim_offset.rotate",
+    "Rotate and Offset Animation",
+    "Rotate objects and offset their entire animation by the same amount",
+    "rotation_euler", "rotate", _rot_delta, _apply_shift)
+
+ANIMOFFSET_OT_scale = _make_offset_op(
+    "ANIMOFFSET_OT_scale", "anim_offset.scale",
+    "Scale and Offset Animation",
+    "Scale objects and offset their entire animation by the same factor",
+    "scale", "resize", _scale_delta, _apply_scale)
 
 class ANIMOFFSET_PT_panel(bpy.types.Panel):
     """Panel for Animation Offset tools"""
@@ -235,6 +209,13 @@ classes = (
     ANIMOFFSET_PT_panel
 )
 
+# Shift+key shortcuts registered in Object Mode
+_SHORTCUTS = (
+    (ANIMOFFSET_OT_grab.bl_idname, 'G'),
+    (ANIMOFFSET_OT_rotate.bl_idname, 'R'),
+    (ANIMOFFSET_OT_scale.bl_idname, 'S'),
+)
+
 # Store keymaps for cleanup on unregister
 addon_keymaps = []
 
@@ -242,39 +223,17 @@ def register():
     """Register the addon and its classes"""
     for cls in classes:
         bpy.utils.register_class(cls)
-    
+
     # Add shortcuts
     wm = bpy.context.window_manager
     kc = wm.keyconfigs.addon
     if kc:
         km = kc.keymaps.new(name='Object Mode')
-        
-        # Grab shortcut
-        kmi = km.keymap_items.new(
-            ANIMOFFSET_OT_grab.bl_idname,
-            type='G',
-            value='PRESS',
-            shift=True
-        )
-        addon_keymaps.append((km, kmi))
-        
-        # Rotate shortcut
-        kmi = km.keymap_items.new(
-            ANIMOFFSET_OT_rotate.bl_idname,
-            type='R',
-            value='PRESS',
-            shift=True
-        )
-        addon_keymaps.append((km, kmi))
-        
-        # Scale shortcut
-        kmi = km.keymap_items.new(
-            ANIMOFFSET_OT_scale.bl_idname,
-            type='S',
-            value='PRESS',
-            shift=True
+        addon_keymaps.extend(
+            (km, km.keymap_items.new(idname, type=key, value='PRESS',
+                                     shift=True))
+            for idname, key in _SHORTCUTS
         )
-        addon_keymaps.append((km, kmi))
 
 def unregister():
     """Unregister the addon and clean up"""